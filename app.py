@@ -1,7 +1,13 @@
 import os
+import time
+import logging
 import atexit
-from flask import Flask, jsonify, render_template, request
+import threading
+import functools
+from collections import OrderedDict
+from flask import Flask, Response, jsonify, render_template, request
 from dotenv import load_dotenv
+import orjson
 
 # Load .env for local/dev
 load_dotenv()
@@ -17,44 +23,150 @@ SDK_KEY = os.getenv("LAUNCHDARKLY_SDK_KEY", "")
 if not SDK_KEY:
     raise RuntimeError("Set LAUNCHDARKLY_SDK_KEY in your environment or .env file.")
 
+FLAG_KEY_WEB_BANNER = os.getenv("LD_FLAG_KEY_WEB_BANNER", "web-banner")
+# Seconds to reuse a flag evaluation for the same (flag, context); 0 disables
+LD_EVAL_CACHE_TTL = float(os.getenv("LD_EVAL_CACHE_TTL", "1.0"))
+LD_EVAL_CACHE_SIZE = 4096
+
 ldclient.set_config(Config(SDK_KEY))
+# ldclient.get() blocks (up to 5s) until the first flag payload arrives
 ld = ldclient.get()
+if not ld.is_initialized():
+    logging.getLogger(__name__).warning(
+        "LaunchDarkly client did not initialize within its start wait; flag evaluations return defaults until it connects"
+    )
+
+_ld_closed = False
+
+def close_ld():
+    """Close the LD client once; gunicorn.conf.py calls this from worker_exit."""
+    global _ld_closed
+    if _ld_closed:
+        return
+    _ld_closed = True
+    ld.close()
 
-# Ensure clean shutdown
+# Fallback shutdown for non-Gunicorn runs; a no-op once worker_exit has closed LD
 @atexit.register
 def _close_ld():
     try:
-        ld.close()
+        close_ld()
     except Exception:
         pass
 
 app = Flask(__name__)
 
-def user_context_from_request():
+# Request-invariant context, built once at import instead of per request
+_WEB_VISITOR_CTX = Context.builder("web-visitor").build()
+
+# Static health-check response, built once and returned as-is on every hit
+HEALTH_OK = Response(b"ok", status=200, mimetype="text/plain")
+HEALTH_OK.headers["Content-Length"] = "2"
+HEALTH_OK.direct_passthrough = True
+
+# Contexts are immutable, so one per user key can be reused across requests
+@functools.lru_cache(maxsize=8192)
+def user_context(user_key):
     # Very basic demo context; in real apps, include real user attributes.
-    user_key = request.args.get("user", "anon")
     return Context.builder(user_key).build()
 
+# Short-lived memo in front of ld.variation(), keyed by (flag_key, context key, default)
+_FLAG_CACHE = OrderedDict()
+_FLAG_CACHE_LOCK = threading.Lock()
+_MISS = object()
+# Bumped per flag key on eviction so an in-flight miss can't store a pre-change value
+_FLAG_GENERATIONS = {}
+
+def evaluate_flag(flag_key, ctx, default=False):
+    """Evaluate a flag, reusing results for up to LD_EVAL_CACHE_TTL seconds.
+
+    Cached hits skip the SDK call, so they don't emit analytics events.
+    Use ld.variation_detail() directly when the evaluation reason matters.
+    """
+    if LD_EVAL_CACHE_TTL <= 0:
+        return ld.variation(flag_key, ctx, default)
+    cache_key = (flag_key, ctx.key, default)
+    now = time.monotonic()
+    with _FLAG_CACHE_LOCK:
+        entry = _FLAG_CACHE.get(cache_key, _MISS)
+        if entry is not _MISS and entry[0] > now:
+            _FLAG_CACHE.move_to_end(cache_key)
+            return entry[1]
+        generation = _FLAG_GENERATIONS.get(flag_key, 0)
+    value = ld.variation(flag_key, ctx, default)
+    with _FLAG_CACHE_LOCK:
+        if _FLAG_GENERATIONS.get(flag_key, 0) != generation:
+            # The flag changed while we were evaluating; don't cache a stale value
+            return value
+        _FLAG_CACHE[cache_key] = (now + LD_EVAL_CACHE_TTL, value)
+        _FLAG_CACHE.move_to_end(cache_key)
+        if len(_FLAG_CACHE) > LD_EVAL_CACHE_SIZE:
+            _FLAG_CACHE.popitem(last=False)
+    return value
+
+def _evict_flag(flag_key):
+    with _FLAG_CACHE_LOCK:
+        _FLAG_GENERATIONS[flag_key] = _FLAG_GENERATIONS.get(flag_key, 0) + 1
+        for cache_key in [k for k in _FLAG_CACHE if k[0] == flag_key]:
+            del _FLAG_CACHE[cache_key]
+
+def watch_flag_changes():
+    """Evict cached evaluations as soon as LD streams a change for that flag.
+
+    Re-run by postfork() below, since ld.postfork() restarts the client internals.
+    """
+    ld.flag_tracker.add_listener(lambda change: _evict_flag(change.key))
+
+watch_flag_changes()
+
+def postfork():
+    """Restart the LD client in a forked worker and re-attach the cache listener.
+
+    Called from gunicorn.conf.py's post_fork hook.
+    """
+    ld.postfork()
+    try:
+        watch_flag_changes()
+    except Exception as e:
+        raise RuntimeError(
+            "LaunchDarkly flag-change listener not re-registered; cached evaluations will only expire by TTL"
+        ) from e
+
+# The home page only has two possible renderings (banner on/off), so render both once
+with app.app_context():
+    _HOME_PAGES = {
+        banner_on: render_template("index.html", banner_on=banner_on, flag_key=FLAG_KEY_WEB_BANNER)
+        for banner_on in (True, False)
+    }
+
+def _flag_json(flag_key, user_key, value):
+    # Splice orjson-encoded fields into a fixed template rather than building a dict
+    body = b'{"flag":%b,"user":%b,"value":%b}' % (
+        orjson.dumps(flag_key), orjson.dumps(user_key), orjson.dumps(value)
+    )
+    return Response(body, mimetype="application/json")
+
 @app.get("/")
 def home():
     """Server-side rendered page that uses a flag to toggle a banner."""
-    flag_key = os.getenv("LD_FLAG_KEY_WEB_BANNER", "web-banner")
-    ctx = Context.builder("web-visitor").build()
-    banner_on = ld.variation(flag_key, ctx, default=False)
-    return render_template("index.html", banner_on=banner_on, flag_key=flag_key)
+    banner_on = evaluate_flag(FLAG_KEY_WEB_BANNER, _WEB_VISITOR_CTX, default=False)
+    return _HOME_PAGES[bool(banner_on)]
 
 @app.get("/api/flag/<flag_key>")
 def read_flag(flag_key):
     """Simple JSON API to evaluate any flag for a given user (?user=key)."""
-    ctx = user_context_from_request()
-    value = ld.variation(flag_key, ctx, default=False)
     user_key = request.args.get("user", "anon")
-    return jsonify({
-        "flag": flag_key,
-        "user": user_key,
-        "value": value
-    })
+    ctx = user_context(user_key)
+    value = evaluate_flag(flag_key, ctx, default=False)
+    if app.debug:
+        # Pretty-printed output while developing
+        return jsonify({
+            "flag": flag_key,
+            "user": user_key,
+            "value": value
+        })
+    return _flag_json(flag_key, user_key, value)
 
 @app.get("/health")
 def health():
-    return "ok", 200
+    return HEALTH_OK
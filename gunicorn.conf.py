@@ -1,12 +1,22 @@
 # Gunicorn config for Flask + LaunchDarkly (with postfork best practice)
 # Use with: gunicorn --config gunicorn.conf.py app:app
+import threading
+
 import ldclient
 
+# Probed once on the class: gunicorn reads this file before the app (and the
+# LD client) is loaded, so ldclient.get() isn't available yet.
+_LD_HAS_POSTFORK = hasattr(ldclient.LDClient, "postfork")
+
 bind = "0.0.0.0:8000"
 workers = 2
-# Use multiple threads for better concurrency with I/O-bound operations
-# LaunchDarkly SDK manages its own internal threads automatically
-threads = 2
+# Gunicorn already switches to gthread when threads > 1; worker_class only
+# makes that explicit. Handlers here are I/O-bound (flag evaluation is an
+# in-memory lookup), so threads add concurrency without extra processes.
+# LaunchDarkly SDK manages its own internal threads automatically; those
+# don't survive fork, which is why post_fork() below must call postfork().
+worker_class = "gthread"
+threads = 8
 timeout = 30
 accesslog = "-"
 errorlog = "-"
@@ -26,9 +36,33 @@ def post_fork(server, worker):
     This requires LaunchDarkly SDK v9.11+ and works in Docker environments
     with proper Python/OpenSSL setup.
     """
+    if not _LD_HAS_POSTFORK:
+        raise RuntimeError("launchdarkly-server-sdk < 9.11 detected; upgrade to support forked workers")
+    threads_before = threading.active_count()
     try:
-        client = ldclient.get()
-        client.postfork()
-        server.log.info(f"✓ LaunchDarkly postfork() completed successfully in worker {worker.pid}")
+        # app.postfork() runs client.postfork() and re-attaches the eval-cache
+        # flag-change listener; already imported thanks to preload_app.
+        import app
+        app.postfork()
+        server.log.info(
+            f"✓ LaunchDarkly postfork() completed successfully in worker {worker.pid} "
+            f"(threads {threads_before} -> {threading.active_count()})"
+        )
     except Exception as e:
         server.log.exception(f"✗ LaunchDarkly postfork() failed in worker {worker.pid}: {e}")
+
+def worker_exit(server, worker):
+    """
+    Close the LaunchDarkly client while the worker is still fully alive.
+
+    atexit handlers run during interpreter teardown, after Gunicorn's signal
+    handling, where flushing analytics events can hang or be skipped. Closing
+    here flushes events deterministically; app.py's atexit hook remains as a
+    fallback for non-Gunicorn runs and skips the client once it's closed.
+    """
+    try:
+        import app
+        app.close_ld()
+        server.log.info(f"✓ LaunchDarkly client closed in worker {worker.pid}")
+    except Exception:
+        server.log.exception(f"✗ LaunchDarkly close failed in worker {worker.pid}")